@@ -1,47 +1,50 @@
 """Command Line Interface for Document Knowledge Base."""
 
 import argparse
-from pathlib import Path
-from config import Config
-from src.ingestion.pipeline import IngestionPipeline
-from src.utils.file_utils import list_and_validate_documents
+import sys
+from config import Config, REQUIRED_DIRS
+from src.utils.logging_utils import flush_logs, setup_logging
 
 
 def setup_directories():
     """Setup required directories."""
-    directories = [
-        Config.PDF_DATA_PATH,
-        Config.IMAGE_OUTPUT_PATH,
-        Config.PROCESSED_DATA_PATH,
-        Config.LOG_DIR,
-        Config.CHROMA_DB_PATH
-    ]
-    
-    for directory in directories:
-        Path(directory).mkdir(parents=True, exist_ok=True)
+    for directory in REQUIRED_DIRS:
+        if not directory.exists():
+            directory.mkdir(parents=True, exist_ok=True)
 
 
 def cmd_list_documents(args):
     """List document files command."""
+    from src.utils.file_utils import list_and_validate_documents
+    
     directory = args.directory or Config.PDF_DATA_PATH
     
     print(f"Listing document files in: {directory}")
     print("=" * 60)
     
-    doc_files = list_and_validate_documents(directory)
+    result = list_and_validate_documents(directory)
+    flush_logs()
     
-    if doc_files:
-        readable_count = sum(1 for f in doc_files if f['is_readable'])
-        print(f"\nReady to process: {readable_count} files")
+    if result.files:
+        print(f"\nReady to process: {result.readable_count} files")
     else:
         print("No document files found.")
 
 
 def cmd_ingest_documents(args):
     """Ingest document files command."""
+    from src.ingestion.pipeline import IngestionPipeline
+    
+    setup_directories()
+    
     directory = args.directory or Config.PDF_DATA_PATH
     
-    pipeline = IngestionPipeline()
+    pipeline = IngestionPipeline(
+        workers=args.workers,
+        backend=args.backend,
+        force=args.force,
+        assume_yes=args.yes
+    )
     pipeline.run_ingestion(directory)
 
 
@@ -72,6 +75,63 @@ def cmd_show_config(args):
     print(f"  Retrieval K: {Config.RETRIEVAL_K}")
 
 
+def _build_list_parser(subparsers):
+    """Add the 'list' subcommand."""
+    list_parser = subparsers.add_parser('list', help='List document files')
+    list_parser.add_argument(
+        '-d', '--directory',
+        help=f'Directory to scan (default: {Config.PDF_DATA_PATH})'
+    )
+
+
+def _build_ingest_parser(subparsers):
+    """Add the 'ingest' subcommand."""
+    ingest_parser = subparsers.add_parser('ingest', help='Ingest document files')
+    ingest_parser.add_argument(
+        '-d', '--directory',
+        help=f'Directory to process (default: {Config.PDF_DATA_PATH})'
+    )
+    ingest_parser.add_argument(
+        '-w', '--workers',
+        type=int, default=1,
+        help='Number of files to process in parallel (default: 1; 0 uses all CPU cores)'
+    )
+    ingest_parser.add_argument(
+        '--backend',
+        choices=['process', 'thread'], default='process',
+        help='Run parallel workers as processes or threads (default: process); '
+             'threads only overlap OCR, since PDF parsing is serialized'
+    )
+    ingest_parser.add_argument(
+        '-f', '--force',
+        action='store_true',
+        help='Reprocess files even if unchanged since the last run'
+    )
+    ingest_parser.add_argument(
+        '-y', '--yes',
+        action='store_true',
+        help='Process files without asking for confirmation'
+    )
+    ingest_parser.add_argument(
+        '-q', '--quiet',
+        action='store_true',
+        help='Only show warnings, errors and the confirmation prompt'
+    )
+
+
+def _build_config_parser(subparsers):
+    """Add the 'config' subcommand."""
+    subparsers.add_parser('config', help='Show configuration')
+
+
+# Subcommand name -> (parser builder, handler)
+COMMANDS = {
+    'list': (_build_list_parser, cmd_list_documents),
+    'ingest': (_build_ingest_parser, cmd_ingest_documents),
+    'config': (_build_config_parser, cmd_show_config),
+}
+
+
 def main():
     """Main CLI function."""
     parser = argparse.ArgumentParser(
@@ -88,25 +148,15 @@ Examples:
     
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
-    # List command
-    list_parser = subparsers.add_parser('list', help='List document files')
-    list_parser.add_argument(
-        '-d', '--directory',
-        help=f'Directory to scan (default: {Config.PDF_DATA_PATH})'
-    )
-    list_parser.set_defaults(func=cmd_list_documents)
-    
-    # Ingest command
-    ingest_parser = subparsers.add_parser('ingest', help='Ingest document files')
-    ingest_parser.add_argument(
-        '-d', '--directory',
-        help=f'Directory to process (default: {Config.PDF_DATA_PATH})'
-    )
-    ingest_parser.set_defaults(func=cmd_ingest_documents)
-    
-    # Config command
-    config_parser = subparsers.add_parser('config', help='Show configuration')
-    config_parser.set_defaults(func=cmd_show_config)
+    # Only build the subparser that was asked for; help and unknown
+    # commands get the full tree so usage and errors stay complete.
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command in COMMANDS:
+        build_parser, _ = COMMANDS[command]
+        build_parser(subparsers)
+    else:
+        for build_parser, _ in COMMANDS.values():
+            build_parser(subparsers)
     
     # Parse arguments
     args = parser.parse_args()
@@ -115,11 +165,11 @@ Examples:
         parser.print_help()
         return
     
-    # Setup directories
-    setup_directories()
+    setup_logging(quiet=getattr(args, 'quiet', False))
     
     # Run the selected command
-    args.func(args)
+    _, handler = COMMANDS[args.command]
+    handler(args)
 
 
 if __name__ == "__main__":
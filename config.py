@@ -1,44 +1,71 @@
 """Configuration settings for Document Knowledge Base system."""
 
+from dataclasses import dataclass
+from pathlib import Path
+from typing import FrozenSet, Optional
 
-class Config:
+
+@dataclass(frozen=True, slots=True)
+class _Config:
     """Configuration class with all system settings."""
     
     # Application settings
-    APP_NAME = "Document Knowledge Base"
-    DEBUG = False
-    LOG_LEVEL = "INFO"
+    APP_NAME: str = "Document Knowledge Base"
+    DEBUG: bool = False
+    LOG_LEVEL: str = "INFO"
     
     # Data paths (currently focused on PDFs)
-    PDF_DATA_PATH = "./data/pdfs"
-    IMAGE_OUTPUT_PATH = "./data/images"
-    PROCESSED_DATA_PATH = "./data/processed"
-    LOG_DIR = "./logs"
+    PDF_DATA_PATH: str = "./data/pdfs"
+    IMAGE_OUTPUT_PATH: str = "./data/images"
+    PROCESSED_DATA_PATH: str = "./data/processed"
+    LOG_DIR: str = "./logs"
+    PROCESSED_MANIFEST: str = "processed.jsonl"  # Per-file summaries, one JSON object per line
+    PER_FILE_SUMMARIES: bool = False  # Write <name>_summary.json files instead of the manifest
+    
+    # Supported file extensions, lower-case for direct set lookups
+    PDF_EXTS: FrozenSet[str] = frozenset({'.pdf'})
+    TEXT_EXTS: FrozenSet[str] = frozenset({'.txt', '.md'})
+    DOC_EXTS: FrozenSet[str] = frozenset({'.pdf', '.txt', '.md', '.docx', '.doc'})
     
     # Document processing settings (currently PDF-specific)
-    MAX_PAGES_PER_PDF = None  # Process all pages if None
-    MAX_PAGES_PER_PDF = 5  # Process all pages if None
-    MIN_IMAGE_WIDTH = 100
-    MIN_IMAGE_HEIGHT = 100
+    MAX_PAGES_PER_PDF: Optional[int] = 5  # Process all pages if None
+    MIN_IMAGE_WIDTH: int = 100
+    MIN_IMAGE_HEIGHT: int = 100
+    OCR_MIN_PIXEL_VARIANCE: float = 50.0  # Flatter images are skipped as blank
+    OCR_MAX_DIM: int = 2000  # Larger images are downscaled before OCR
     
     # Text processing settings
-    CHUNK_SIZE = 1000
-    CHUNK_OVERLAP = 100
+    CHUNK_SIZE: int = 1000
+    CHUNK_OVERLAP: int = 100
     
     # Embedding settings
-    EMBEDDING_MODEL = "all-MiniLM-L6-v2"
-    EMBEDDING_DIMENSION = 384
+    EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    EMBEDDING_DIMENSION: int = 384
     
     # Vector database settings
-    CHROMA_DB_PATH = "./data/chroma_db"
-    COLLECTION_NAME = "knowledge_base"
+    CHROMA_DB_PATH: str = "./data/chroma_db"
+    COLLECTION_NAME: str = "knowledge_base"
     
     # Retrieval settings
-    RETRIEVAL_K = 5
-    SIMILARITY_THRESHOLD = 0.7
+    RETRIEVAL_K: int = 5
+    SIMILARITY_THRESHOLD: float = 0.7
     
     # LLM settings (VertexAI)
-    VERTEX_AI_PROJECT = None  # Set your project ID here
-    VERTEX_AI_REGION = "us-central1"
-    VERTEX_AI_MODEL = "text-bison"
-    
\ No newline at end of file
+    VERTEX_AI_PROJECT: Optional[str] = None  # Set your project ID here
+    VERTEX_AI_REGION: str = "us-central1"
+    VERTEX_AI_MODEL: str = "text-bison"
+
+
+# Single shared, immutable settings instance
+Config = _Config()
+
+# Directories the ingestion pipeline writes to, built once at import
+REQUIRED_DIRS = tuple(
+    Path(directory) for directory in (
+        Config.PDF_DATA_PATH,
+        Config.IMAGE_OUTPUT_PATH,
+        Config.PROCESSED_DATA_PATH,
+        Config.LOG_DIR,
+        Config.CHROMA_DB_PATH,
+    )
+)
@@ -1,42 +1,43 @@
 """Main entry point for PDF Knowledge Base system."""
 
 import sys
-from pathlib import Path
-from config import Config
-from src.ingestion.pipeline import IngestionPipeline
-from src.utils.file_utils import list_and_validate_pdfs
+from config import Config, REQUIRED_DIRS
 
 
 def create_directories():
     """Create required directories if they don't exist."""
-    directories = [
-        Config.PDF_DATA_PATH,
-        Config.IMAGE_OUTPUT_PATH,
-        Config.PROCESSED_DATA_PATH,
-        Config.LOG_DIR,
-        Config.CHROMA_DB_PATH
-    ]
-    
-    for directory in directories:
-        Path(directory).mkdir(parents=True, exist_ok=True)
+    for directory in REQUIRED_DIRS:
+        if not directory.exists():
+            directory.mkdir(parents=True, exist_ok=True)
 
 
 def list_pdfs_only():
     """List PDF files without processing them."""
+    from src.utils.file_utils import list_and_validate_pdfs
+    from src.utils.logging_utils import flush_logs, setup_logging
+    
+    setup_logging()
+    
     print("PDF KNOWLEDGE BASE - FILE LISTING")
     print("=" * 50)
     
-    pdf_files = list_and_validate_pdfs(Config.PDF_DATA_PATH)
+    result = list_and_validate_pdfs(Config.PDF_DATA_PATH)
+    flush_logs()
     
-    if pdf_files:
-        readable_count = sum(1 for f in pdf_files if f['is_readable'])
-        print(f"Summary: Found {readable_count} readable PDF files out of {len(pdf_files)} total files.")
+    if result.files:
+        print(f"Summary: Found {result.readable_count} readable PDF files out of {len(result.files)} total files.")
     
-    return pdf_files
+    return result.files
 
 
 def run_ingestion():
     """Run the full ingestion pipeline."""
+    from src.ingestion.pipeline import IngestionPipeline
+    from src.utils.logging_utils import setup_logging
+    
+    setup_logging()
+    create_directories()
+    
     pipeline = IngestionPipeline()
     pipeline.run_ingestion()
 
@@ -64,14 +65,11 @@ Examples:
 
 def main():
     """Main function."""
-    # Ensure directories exist
-    create_directories()
-    
     # Get command line argument
     command = sys.argv[1].lower() if len(sys.argv) > 1 else "list"
     
     if command == "list":
-        list_documents_only()
+        list_pdfs_only()
     elif command == "ingest":
         run_ingestion()
     elif command == "help":
@@ -1,59 +1,213 @@
 """OCR processor for image text extraction using Tesseract."""
 
+from __future__ import annotations
+
+import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List
-from pytesseract import image_to_data, Output
-from PIL import Image
+from typing import TYPE_CHECKING, Dict, List, Union
+import numpy as np
+from config import Config
+
+# Imaging and OCR libraries are imported where they're used, so importing
+# this module stays cheap for code paths that never OCR anything
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Bounding box fields reported for each OCR word
+_BOX_FIELDS = ('left', 'top', 'width', 'height')
+
+# Fields read when deciding whether an OCR result is worth keeping
+_usefulness_fields = itemgetter('has_text', 'word_count', 'char_count')
+
+# One in-process Tesseract API per thread; PyTessBaseAPI isn't thread-safe
+_tess_local = threading.local()
+
+
+@lru_cache(maxsize=1)
+def _load_tesserocr():
+    """Import tesserocr once, returning None if it isn't installed."""
+    try:
+        import tesserocr
+    except ImportError:  # Fall back to spawning the tesseract binary per image
+        return None
+    return tesserocr
+
+
+def image_to_ocr_data(image: Image.Image) -> Dict[str, List]:
+    """
+    Run Tesseract on an image and return word-level results.
+    
+    Uses tesserocr's in-process API when it is installed, which avoids the
+    cost of starting a tesseract subprocess for every image, and falls back
+    to pytesseract otherwise.
+    
+    Args:
+        image: Opened PIL image
+        
+    Returns:
+        Dictionary of parallel lists ('text', 'conf', 'left', 'top',
+        'width', 'height'), in the same shape as pytesseract's Output.DICT
+    """
+    tesserocr = _load_tesserocr()
+    if tesserocr is None:
+        from pytesseract import image_to_data, Output
+        return image_to_data(image, output_type=Output.DICT)
+    
+    api = getattr(_tess_local, 'api', None)
+    if api is None:
+        api = _tess_local.api = tesserocr.PyTessBaseAPI()
+    
+    api.SetImage(image)
+    api.Recognize()
+    
+    data = {'text': [], 'conf': [], 'left': [], 'top': [], 'width': [], 'height': []}
+    iterator = api.GetIterator()
+    if iterator is None:
+        return data
+    
+    level = tesserocr.RIL.WORD
+    for word in tesserocr.iterate_level(iterator, level):
+        box = word.BoundingBox(level)
+        if box is None:
+            continue
+        left, top, right, bottom = box
+        data['text'].append(word.GetUTF8Text(level) or "")
+        data['conf'].append(word.Confidence(level))
+        data['left'].append(left)
+        data['top'].append(top)
+        data['width'].append(right - left)
+        data['height'].append(bottom - top)
+    
+    return data
+
+
+def _empty_word_details() -> Dict[str, np.ndarray]:
+    """Word details for an image without any recognised words."""
+    return {
+        'word': np.empty(0, dtype=str),
+        'confidence': np.empty(0, dtype=np.int32),
+        **{field: np.empty(0, dtype=np.int32) for field in _BOX_FIELDS}
+    }
+
+
+def is_blank_image(image: Image.Image, min_variance: float) -> bool:
+    """
+    Check whether an image is too uniform to contain any text.
+    
+    Solid backgrounds and decorative banners have almost no grayscale
+    variance, so they can be skipped for a fraction of the cost of OCR.
+    
+    Args:
+        image: Opened PIL image
+        min_variance: Minimum grayscale pixel variance for an image to be OCRed
+        
+    Returns:
+        True if the image's pixel variance is below the threshold
+    """
+    pixels = np.asarray(image.convert('L'), dtype=np.uint8)
+    return float(pixels.var()) < min_variance
+
+
+def downscale_for_ocr(image: Image.Image, max_dim: int) -> Image.Image:
+    """
+    Shrink an image so its longest edge is at most max_dim pixels.
+    
+    Tesseract's runtime grows with pixel count, and body text stays
+    legible well below the resolution of large embedded figures.
+    
+    Args:
+        image: Opened PIL image
+        max_dim: Maximum length of the longest edge in pixels
+        
+    Returns:
+        The downscaled image, or the original if it is already small enough
+    """
+    from PIL import Image
+    
+    longest_edge = max(image.size)
+    if longest_edge <= max_dim:
+        return image
+    
+    scale = max_dim / longest_edge
+    new_size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+    return image.resize(new_size, Image.LANCZOS)
 
 
 class OCRProcessor:
     """OCR processor for extracting text from images using Tesseract."""
     
-    def __init__(self, min_confidence: int = 50):
+    def __init__(self, min_confidence: int = 50, 
+                 min_variance: float = Config.OCR_MIN_PIXEL_VARIANCE):
         """
         Initialize OCR processor.
         
         Args:
             min_confidence: Minimum confidence threshold for OCR text
+            min_variance: Minimum grayscale pixel variance; flatter images
+                are treated as blank and skip OCR
         """
         self.min_confidence = min_confidence
+        self.min_variance = min_variance
+    
+    def _ocr(self, image: Image.Image) -> Dict[str, List]:
+        """Run OCR on an opened image, skipping images that are blank."""
+        if is_blank_image(image, self.min_variance):
+            return {'text': [], 'conf': [], 'left': [], 'top': [], 'width': [], 'height': []}
+        return image_to_ocr_data(image)
     
-    def process_image(self, image_path: str) -> Dict:
+    def process_image(self, image: Union[str, Image.Image]) -> Dict:
         """
         Process a single image with OCR.
         
         Args:
-            image_path: Path to the image file
+            image: Path to the image file or an already opened PIL image
             
         Returns:
             Dictionary containing OCR results
         """
+        from PIL import Image
+        
+        if isinstance(image, Image.Image):
+            image_path = getattr(image, 'filename', '')
+        else:
+            image_path = image
+        
         try:
-            image_path_obj = Path(image_path)
-            
-            if not image_path_obj.exists():
-                raise FileNotFoundError(f"Image file not found: {image_path}")
-            
-            # Run OCR with detailed output
-            data = image_to_data(Image.open(image_path), output_type=Output.DICT)
+            if isinstance(image, Image.Image):
+                data = self._ocr(image)
+            else:
+                if not Path(image_path).exists():
+                    raise FileNotFoundError(f"Image file not found: {image_path}")
+                
+                # Decode once and hand the pixel buffer straight to Tesseract
+                with Image.open(image_path) as img:
+                    img.load()
+                    data = self._ocr(img)
             
             # Extract words with confidence above threshold
-            valid_words = []
-            word_details = []
+            words = np.char.strip(np.asarray(data["text"], dtype=str))
+            confidences = np.asarray(data["conf"], dtype=float).astype(np.int32)
+            keep = (confidences > self.min_confidence) & (np.char.str_len(words) > 0)
+            indices = keep.nonzero()[0]
             
-            for i, (word, conf) in enumerate(zip(data["text"], data["conf"])):
-                if int(conf) > self.min_confidence and word.strip():
-                    clean_word = word.strip()
-                    valid_words.append(clean_word)
-                    word_details.append({
-                        'word': clean_word,
-                        'confidence': int(conf),
-                        'left': data['left'][i],
-                        'top': data['top'][i],
-                        'width': data['width'][i],
-                        'height': data['height'][i]
-                    })
+            # Word details are kept as parallel arrays (one per field) rather
+            # than a dict per word
+            word_details = {
+                'word': words[indices],
+                'confidence': confidences[indices],
+                **{
+                    field: np.asarray(data[field], dtype=np.int32)[indices]
+                    for field in _BOX_FIELDS
+                }
+            }
+            valid_words = word_details['word'].tolist()
             
             extracted_text = " ".join(valid_words)
             
@@ -64,7 +218,7 @@ class OCRProcessor:
                 'char_count': len(extracted_text),
                 'word_details': word_details,
                 'has_text': len(valid_words) > 0,
-                'average_confidence': sum(w['confidence'] for w in word_details) / len(word_details) if word_details else 0
+                'average_confidence': float(word_details['confidence'].mean()) if indices.size else 0
             }
             
         except Exception as e:
@@ -73,7 +227,7 @@ class OCRProcessor:
                 'extracted_text': "",
                 'word_count': 0,
                 'char_count': 0,
-                'word_details': [],
+                'word_details': _empty_word_details(),
                 'has_text': False,
                 'average_confidence': 0,
                 'error': str(e)
@@ -89,15 +243,21 @@ class OCRProcessor:
         Returns:
             List of OCR result dictionaries
         """
-        results = []
-        
         for image_path in image_paths:
-            print(f"  - Processing OCR for: {Path(image_path).name}")
-            result = self.process_image(image_path)
-            results.append(result)
+            logger.info(f"  - Processing OCR for: {Path(image_path).name}")
+        
+        # Tesseract runs outside the GIL, so threads give real parallelism
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = list(executor.map(self.process_image, image_paths))
         
         return results
     
+    @staticmethod
+    def _is_useful(result: Dict, min_words: int, min_chars: int) -> bool:
+        """Check whether an OCR result contains enough text to keep."""
+        has_text, word_count, char_count = _usefulness_fields(result)
+        return has_text and word_count >= min_words and char_count >= min_chars
+    
     def filter_useful_images(self, ocr_results: List[Dict], 
                            min_words: int = 3, min_chars: int = 10) -> List[Dict]:
         """
@@ -112,28 +272,28 @@ class OCRProcessor:
             Filtered list of useful OCR results
         """
         useful_results = []
+        useless_paths = []
         
         for result in ocr_results:
-            if (result['has_text'] and 
-                result['word_count'] >= min_words and 
-                result['char_count'] >= min_chars):
+            if self._is_useful(result, min_words, min_chars):
                 useful_results.append(result)
             else:
-                # Remove image file if it doesn't contain useful text
-                image_path = Path(result['image_path'])
-                if image_path.exists():
-                    try:
-                        image_path.unlink()
-                        print(f"  - Removed image with no useful text: {image_path.name}")
-                    except Exception:
-                        pass
+                useless_paths.append(result['image_path'])
+        
+        # Remove image files that don't contain useful text; a missing file
+        # is cheaper to handle than to check for up front
+        for image_path in useless_paths:
+            try:
+                os.unlink(image_path)
+            except OSError:
+                pass
         
         return useful_results
 
 
 def main():
     """Test the OCR processor."""
-    from config import Config
+    logging.basicConfig(level=Config.LOG_LEVEL, format="%(message)s")
     
     processor = OCRProcessor(min_confidence=50)
     
@@ -1,21 +1,57 @@
 """PDF document loader with text and image extraction using PyMuPDF and LangChain."""
 
+from __future__ import annotations
+
+import io
+import logging
 import os
-import fitz  # PyMuPDF
-from langchain_community.document_loaders import PyPDFLoader
-from langchain.schema import Document
-from pytesseract import image_to_data, Output
-from PIL import Image
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
 from pathlib import Path
-from typing import List, Dict
+from typing import TYPE_CHECKING, Iterable, List, Dict, Optional, Tuple, Union
 from config import Config
+from src.document_loader.ocr_processor import downscale_for_ocr, image_to_ocr_data, is_blank_image
+from src.utils.logging_utils import flush_logs
+
+# PyMuPDF, LangChain and PIL are imported where they're used, so importing
+# this module stays cheap for code paths that never load a PDF
+if TYPE_CHECKING:
+    import fitz  # PyMuPDF
+    from langchain.schema import Document
+    from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# PyMuPDF doesn't support use from several threads at once, so every call
+# into it goes through this lock; OCR runs outside it and can overlap
+_FITZ_LOCK = threading.Lock()
+
+# Config settings that change what load_pdf extracts; page workers receive
+# them as a dict, and the ingestion cache only reuses results while they match
+EXTRACTION_SETTINGS = (
+    'MAX_PAGES_PER_PDF',
+    'IMAGE_OUTPUT_PATH',
+    'MIN_IMAGE_WIDTH',
+    'MIN_IMAGE_HEIGHT',
+    'OCR_MIN_PIXEL_VARIANCE',
+    'OCR_MAX_DIM',
+)
 
 
 class PDFLoader:
     """PDF document loader for text and image extraction."""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = None):
+        """
+        Initialize PDF loader.
+        
+        Args:
+            max_workers: Maximum worker processes for page image extraction
+                (defaults to the CPU count; 1 disables multiprocessing)
+        """
         self.config = Config
+        self.max_workers = max_workers
     
     def load_pdf(self, pdf_path: str) -> Dict:
         """
@@ -25,19 +61,31 @@ class PDFLoader:
             pdf_path: Path to the PDF file
             
         Returns:
-            Dictionary containing extracted documents and metadata
+            Dictionary containing extracted documents and metadata;
+            'extraction_errors' counts text or image extraction steps that
+            failed and were skipped, so the result may be incomplete
         """
-        print(f"  - Loading PDF: {Path(pdf_path).name}")
-        
-        # Extract text using LangChain PyPDFLoader
-        text_documents = self._load_text_with_pypdf(pdf_path)
-        
-        print(f"  - Extracted text from {len(text_documents)} pages")
+        import fitz  # PyMuPDF
         
-        # Extract images and run OCR
-        image_documents = self._load_images_with_ocr(pdf_path)
+        logger.info(f"  - Loading PDF: {Path(pdf_path).name}")
         
-        print(f"  - Extracted and processed {len(image_documents)} images with OCR")
+        # Open the PDF once and share the handle between text and image extraction
+        with _FITZ_LOCK:
+            doc = fitz.open(pdf_path)
+        try:
+            # Extract text using PyMuPDF
+            with _FITZ_LOCK:
+                text_documents, text_errors = self._load_text(doc, pdf_path)
+            
+            logger.info(f"  - Extracted text from {len(text_documents)} pages")
+            
+            # Extract images and run OCR
+            image_documents, image_errors = self._load_images_with_ocr(doc, pdf_path)
+            
+            logger.info(f"  - Extracted and processed {len(image_documents)} images with OCR")
+        finally:
+            with _FITZ_LOCK:
+                doc.close()
         
         # Combine all documents
         all_documents = text_documents + image_documents
@@ -48,141 +96,162 @@ class PDFLoader:
             'documents': all_documents,
             'text_document_count': len(text_documents),
             'image_document_count': len(image_documents),
-            'total_document_count': len(all_documents)
+            'total_document_count': len(all_documents),
+            'extraction_errors': text_errors + image_errors
         }
     
-    def _load_text_with_pypdf(self, pdf_path: str) -> List[Document]:
+    def extraction_settings(self) -> Dict:
+        """Current values of the settings that affect extraction results."""
+        return {name: getattr(self.config, name) for name in EXTRACTION_SETTINGS}
+    
+    def _num_pages_to_process(self, doc: fitz.Document) -> int:
+        """Number of pages to process, honouring MAX_PAGES_PER_PDF."""
+        max_pages = self.config.MAX_PAGES_PER_PDF
+        return min(max_pages, len(doc)) if max_pages else len(doc)
+    
+    def _load_text(self, doc: fitz.Document, pdf_path: str) -> Tuple[List[Document], int]:
+        """
+        Extract page text using PyMuPDF, falling back to PyPDF on failure.
+        
+        Args:
+            doc: Open PyMuPDF document
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            Text Documents and the number of extraction errors (0 or 1)
+        """
+        try:
+            pages = (doc[i].get_text() for i in range(self._num_pages_to_process(doc)))
+            return self._text_documents(pages, pdf_path), 0
+            
+        except Exception as e:
+            logger.warning(f"    Warning: PyMuPDF text extraction failed, retrying with PyPDF: {str(e)}")
+            return self._load_text_with_pypdf(pdf_path)
+    
+    def _load_text_with_pypdf(self, pdf_path: str) -> Tuple[List[Document], int]:
         """
         Extract text using LangChain PyPDFLoader.
         
+        Pages are loaded lazily, so parsing stops once MAX_PAGES_PER_PDF
+        pages have been read.
+        
         Args:
             pdf_path: Path to the PDF file
             
         Returns:
-            List of LangChain Document objects with text content
+            Text Documents and the number of extraction errors (0 or 1)
         """
         try:
-            loader = PyPDFLoader(pdf_path)
-            documents = loader.load()
+            from langchain_community.document_loaders import PyPDFLoader
             
-            docs = []
+            pages = (page.page_content for page in PyPDFLoader(pdf_path).lazy_load())
             max_pages = self.config.MAX_PAGES_PER_PDF
-            pages_to_process = documents[:max_pages] if max_pages else documents
-            
-            for i, doc in enumerate(pages_to_process):
-                if doc.page_content.strip():  # Only add pages with content
-                    docs.append(
-                        Document(
-                            page_content=doc.page_content,
-                            metadata={
-                                "source": pdf_path,
-                                "page": i + 1,
-                                "type": "text",
-                                "char_count": len(doc.page_content)
-                            }
-                        )
-                    )
+            if max_pages:
+                pages = islice(pages, max_pages)
             
-            return docs
+            return self._text_documents(pages, pdf_path), 0
             
         except Exception as e:
-            print(f"    Warning: Failed to extract text from PDF: {str(e)}")
-            return []
+            logger.warning(f"    Warning: Failed to extract text from PDF: {str(e)}")
+            return [], 1
     
-    def _load_images_with_ocr(self, pdf_path: str) -> List[Document]:
+    @staticmethod
+    def _text_documents(pages: Iterable[str], pdf_path: str) -> List[Document]:
+        """
+        Build text Documents from page contents, skipping empty pages.
+        
+        Args:
+            pages: Text of each page, in page order
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            List of LangChain Document objects with text content
+        """
+        from langchain.schema import Document
+        
+        docs = []
+        
+        for i, page_content in enumerate(pages):
+            if page_content.strip():  # Only add pages with content
+                docs.append(
+                    Document(
+                        page_content=page_content,
+                        metadata={
+                            "source": pdf_path,
+                            "page": i + 1,
+                            "type": "text",
+                            "char_count": len(page_content)
+                        }
+                    )
+                )
+        
+        return docs
+    
+    def _load_images_with_ocr(self, doc: fitz.Document, pdf_path: str) -> Tuple[List[Document], int]:
         """
         Extract images from PDF and run OCR with Tesseract.
         
+        Pages are processed in parallel worker processes, each with its own
+        PyMuPDF document handle; the shared handle is only used when
+        running in-process.
+        
         Args:
+            doc: Open PyMuPDF document
             pdf_path: Path to the PDF file
             
         Returns:
-            List of LangChain Document objects with OCR content
+            OCR Documents and the number of images or steps that failed
         """
         try:
             # Setup image output directory
             output_folder = Path(self.config.IMAGE_OUTPUT_PATH)
             output_folder.mkdir(parents=True, exist_ok=True)
             
-            pdf_name = Path(pdf_path).stem
-            doc = fitz.open(pdf_path)
-            docs = []
+            with _FITZ_LOCK:
+                num_pages_to_process = self._num_pages_to_process(doc)
             
-            max_pages = self.config.MAX_PAGES_PER_PDF
-            num_pages_to_process = min(max_pages, len(doc)) if max_pages else len(doc)
+            cfg = self.extraction_settings()
+            page_nums = range(num_pages_to_process)
+            max_workers = min(self.max_workers or os.cpu_count(), num_pages_to_process)
             
-            for page_num in range(num_pages_to_process):
-                page = doc[page_num]
-                images = page.get_images(full=True)
-                
-                for img_index, img in enumerate(images, start=1):
-                    try:
-                        xref = img[0]
-                        pix = fitz.Pixmap(doc, xref)
-                        
-                        # Filter out small images (icons/logos)
-                        if (pix.width < self.config.MIN_IMAGE_WIDTH or 
-                            pix.height < self.config.MIN_IMAGE_HEIGHT):
-                            pix = None
-                            continue
-                        
-                        # Save image
-                        img_filename = f"{pdf_name}_page-{page_num+1}_img-{img_index}.png"
-                        img_path = output_folder / img_filename
-                        
-                        if pix.n - pix.alpha < 4:  # RGB or Gray
-                            pix.save(str(img_path))
-                        else:  # CMYK conversion
-                            pix = fitz.Pixmap(fitz.csRGB, pix)
-                            pix.save(str(img_path))
-                        pix = None
-                        
-                        # Run OCR with Tesseract
-                        ocr_text = self._run_ocr_on_image(img_path)
-                        
-                        if ocr_text.strip():  # Only add if OCR found text
-                            docs.append(
-                                Document(
-                                    page_content=ocr_text,
-                                    metadata={
-                                        "source": pdf_path,
-                                        "page": page_num + 1,
-                                        "image_path": str(img_path),
-                                        "type": "image_ocr",
-                                        "char_count": len(ocr_text)
-                                    }
-                                )
-                            )
-                        else:
-                            # Remove image file if no useful OCR text found
-                            if img_path.exists():
-                                img_path.unlink()
-                    
-                    except Exception as e:
-                        print(f"    Warning: Failed to process image {img_index} on page {page_num + 1}: {str(e)}")
-                        continue
+            if max_workers <= 1:
+                page_results = [_extract_page_images(doc, pdf_path, page_num, cfg) for page_num in page_nums]
+            else:
+                # Write out buffered log lines so forked workers don't inherit them
+                flush_logs()
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    page_results = list(executor.map(
+                        _process_page_images,
+                        repeat(pdf_path), page_nums, repeat(cfg)
+                    ))
             
-            doc.close()
-            return docs
+            docs = [d for page_docs, _ in page_results for d in page_docs]
+            return docs, sum(errors for _, errors in page_results)
             
         except Exception as e:
-            print(f"    Warning: Failed to extract images from PDF: {str(e)}")
-            return []
+            logger.warning(f"    Warning: Failed to extract images from PDF: {str(e)}")
+            return [], 1
     
-    def _run_ocr_on_image(self, img_path: Path, min_confidence: int = 50) -> str:
+    @staticmethod
+    def _run_ocr_on_image(image: Union[Path, Image.Image], min_confidence: int = 50) -> Optional[str]:
         """
         Run OCR on an image using Tesseract.
         
         Args:
-            img_path: Path to the image file
+            image: Path to the image file or an already opened PIL image
             min_confidence: Minimum confidence threshold for OCR text
             
         Returns:
-            Extracted text from the image
+            Extracted text from the image, or None if OCR failed
         """
+        from PIL import Image
+        
         try:
+            if not isinstance(image, Image.Image):
+                image = Image.open(image)
+            
             # Run OCR with detailed output
-            data = image_to_data(Image.open(img_path), output_type=Output.DICT)
+            data = image_to_ocr_data(image)
             
             # Filter words by confidence threshold
             words = [
@@ -194,8 +263,13 @@ class PDFLoader:
             return " ".join(words)
             
         except Exception as e:
-            print(f"    Warning: OCR failed for image {img_path}: {str(e)}")
-            return ""
+            if isinstance(image, Image.Image):
+                # Resized images (see downscale_for_ocr) have no filename attribute
+                image_name = getattr(image, 'filename', '') or "<in-memory>"
+            else:
+                image_name = image
+            logger.warning(f"    Warning: OCR failed for image {image_name}: {str(e)}")
+            return None
     
     def get_pdf_info(self, pdf_path: str) -> Dict:
         """
@@ -207,28 +281,146 @@ class PDFLoader:
         Returns:
             Dictionary with PDF metadata
         """
+        import fitz  # PyMuPDF
+        
         try:
-            doc = fitz.open(pdf_path)
-            
-            info = {
-                'page_count': len(doc),
-                'metadata': doc.metadata,
-                'is_encrypted': doc.needs_pass,
-                'file_size': os.path.getsize(pdf_path)
-            }
-            
-            doc.close()
+            with _FITZ_LOCK:
+                doc = fitz.open(pdf_path)
+                
+                info = {
+                    'page_count': len(doc),
+                    'metadata': doc.metadata,
+                    'is_encrypted': doc.needs_pass,
+                    'file_size': os.path.getsize(pdf_path)
+                }
+                
+                doc.close()
             return info
             
         except Exception as e:
-            print(f"    Warning: Failed to get PDF info: {str(e)}")
+            logger.warning(f"    Warning: Failed to get PDF info: {str(e)}")
             return {}
 
 
+def _process_page_images(pdf_path: str, page_num: int, cfg: Dict) -> Tuple[List[Document], int]:
+    """
+    Worker entry point for extracting and OCRing the images on one page.
+    
+    Kept at module level so it can be pickled for worker processes; each
+    call opens its own PyMuPDF handle since documents can't be shared
+    across processes.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        page_num: Zero-based page index
+        cfg: Extraction settings (see EXTRACTION_SETTINGS)
+        
+    Returns:
+        OCR Documents and the number of images that failed
+    """
+    import fitz  # PyMuPDF
+    
+    with _FITZ_LOCK:
+        doc = fitz.open(pdf_path)
+    try:
+        return _extract_page_images(doc, pdf_path, page_num, cfg)
+    finally:
+        with _FITZ_LOCK:
+            doc.close()
+
+
+def _extract_page_images(doc: fitz.Document, pdf_path: str, page_num: int, cfg: Dict) -> Tuple[List[Document], int]:
+    """
+    Extract images from a single PDF page and run OCR on them.
+    
+    Args:
+        doc: Open PyMuPDF document
+        pdf_path: Path to the PDF file
+        page_num: Zero-based page index
+        cfg: Extraction settings (see EXTRACTION_SETTINGS)
+        
+    Returns:
+        OCR Documents and the number of images that failed
+    """
+    import fitz  # PyMuPDF
+    from langchain.schema import Document
+    from PIL import Image
+    
+    output_folder = Path(cfg['IMAGE_OUTPUT_PATH'])
+    pdf_name = Path(pdf_path).stem
+    docs = []
+    errors = 0
+    
+    with _FITZ_LOCK:
+        images = doc[page_num].get_images(full=True)
+    
+    for img_index, img in enumerate(images, start=1):
+        try:
+            xref, width, height = img[0], img[2], img[3]
+            
+            # Filter out small images (icons/logos) using the size listed
+            # with the image, before anything is decoded
+            if width < cfg['MIN_IMAGE_WIDTH'] or height < cfg['MIN_IMAGE_HEIGHT']:
+                continue
+            
+            with _FITZ_LOCK:
+                info = doc.extract_image(xref)
+                
+                if info['ext'] == 'png':
+                    # Already PNG encoded, no need to decode and recompress
+                    png_bytes = info['image']
+                else:
+                    pix = fitz.Pixmap(doc, xref)
+                    if pix.n - pix.alpha >= 4:  # CMYK conversion
+                        pix = fitz.Pixmap(fitz.csRGB, pix)
+                    png_bytes = pix.tobytes("png")
+                    pix = None
+            
+            # Run OCR with Tesseract on the in-memory image, unless it's blank
+            with Image.open(io.BytesIO(png_bytes)) as pil_img:
+                if is_blank_image(pil_img, cfg['OCR_MIN_PIXEL_VARIANCE']):
+                    ocr_text = ""
+                else:
+                    # Only the OCR input is downscaled; the saved image keeps
+                    # its original resolution
+                    ocr_img = downscale_for_ocr(pil_img, cfg['OCR_MAX_DIM'])
+                    ocr_text = PDFLoader._run_ocr_on_image(ocr_img)
+            
+            if ocr_text is None:
+                errors += 1
+                continue
+            
+            if ocr_text.strip():  # Only save and add if OCR found text
+                img_filename = f"{pdf_name}_page-{page_num+1}_img-{img_index}.png"
+                img_path = output_folder / img_filename
+                img_path.write_bytes(png_bytes)
+                
+                docs.append(
+                    Document(
+                        page_content=ocr_text,
+                        metadata={
+                            "source": pdf_path,
+                            "page": page_num + 1,
+                            "image_path": str(img_path),
+                            "type": "image_ocr",
+                            "char_count": len(ocr_text)
+                        }
+                    )
+                )
+        
+        except Exception as e:
+            logger.warning(f"    Warning: Failed to process image {img_index} on page {page_num + 1}: {str(e)}")
+            errors += 1
+    
+    return docs, errors
+
+
 def main():
     """Test the PDF loader."""
     from config import Config
     
+    logging.basicConfig(level=Config.LOG_LEVEL, format="%(message)s")
+    
     # Create directories
     Path(Config.IMAGE_OUTPUT_PATH).mkdir(parents=True, exist_ok=True)
     
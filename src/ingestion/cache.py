@@ -0,0 +1,85 @@
+"""Persistent cache of ingestion results keyed by file path, size, mtime and settings."""
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class IngestionCache:
+    """SQLite-backed record of files that have already been ingested."""
+    
+    def __init__(self, cache_dir: str, file_name: str = ".qa_ingest_cache.sqlite",
+                 settings: Dict = None):
+        """
+        Initialize the ingestion cache.
+        
+        Args:
+            cache_dir: Directory holding the cache database
+            file_name: Name of the SQLite database file
+            settings: Settings that affect processing results; entries
+                stored under different settings are treated as misses
+        """
+        cache_path = Path(cache_dir)
+        cache_path.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(cache_path / file_name)
+        self.settings_key = json.dumps(settings or {}, sort_keys=True)
+        
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS processed_files ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime REAL, result_json TEXT, settings TEXT)"
+            )
+            # Caches created before settings were recorded; their rows have
+            # no settings and never match
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(processed_files)")}
+            if 'settings' not in columns:
+                conn.execute("ALTER TABLE processed_files ADD COLUMN settings TEXT")
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a short-lived connection, safe to use from any thread or process."""
+        return sqlite3.connect(self.db_path, timeout=30)
+    
+    def lookup(self, file_info: Dict) -> Optional[Dict]:
+        """
+        Get the cached processing result for an unchanged file processed
+        with the current settings.
+        
+        Args:
+            file_info: Dictionary containing file information
+            
+        Returns:
+            Cached processing result, or None if the file is new, has changed
+            or was processed with different settings
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT result_json FROM processed_files "
+                "WHERE path = ? AND size = ? AND mtime = ? AND settings = ?",
+                (os.path.abspath(file_info['path']), file_info['size_bytes'],
+                 file_info['modified'], self.settings_key)
+            ).fetchone()
+        
+        return json.loads(row[0]) if row else None
+    
+    def store(self, file_info: Dict, processing_result: Dict):
+        """
+        Record the processing result for a file.
+        
+        Extracted documents are not cached; only the summary fields are kept.
+        
+        Args:
+            file_info: Dictionary containing file information
+            processing_result: Result from processing the file
+        """
+        result = {k: v for k, v in processing_result.items() if k != 'documents'}
+        
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO processed_files (path, size, mtime, result_json, settings) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (os.path.abspath(file_info['path']), file_info['size_bytes'],
+                 file_info['modified'], json.dumps(result), self.settings_key)
+            )
@@ -1,50 +1,108 @@
 """Main ingestion pipeline for processing document files."""
 
-from typing import List, Dict
+import logging
+import multiprocessing
+import os
+import sys
+import orjson
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
+from typing import Collection, List, Dict
 from pathlib import Path
 from config import Config
 from src.utils.file_utils import list_and_validate_files
 from src.document_loader.pdf_loader import PDFLoader
+from src.ingestion.cache import IngestionCache
+from src.utils.logging_utils import flush_logs, setup_logging
+
+logger = logging.getLogger(__name__)
 
 
 class IngestionPipeline:
     """Main pipeline for ingesting document files into the knowledge base."""
     
-    def __init__(self):
+    def __init__(self, workers: int = 1, backend: str = "process", force: bool = False,
+                 assume_yes: bool = False, page_workers: int = None):
+        """
+        Initialize the ingestion pipeline.
+        
+        Args:
+            workers: Number of files to process in parallel
+                (0 or None uses all CPU cores; 1 processes files one at a time)
+            backend: "process" to run files in worker processes, or "thread"
+                to run them in threads, which skips process start-up and
+                pickling; PyMuPDF calls are serialized across threads, so
+                only OCR and file writes run concurrently
+            force: Reprocess files even if their path, size and modification
+                time match a previous run
+            assume_yes: Skip the confirmation prompt and process the files
+            page_workers: Worker processes for each PDF's page images (default:
+                all CPU cores when files are processed one at a time,
+                otherwise 1 so pools aren't nested)
+        """
+        if backend not in ("process", "thread"):
+            raise ValueError(f"Unsupported backend: {backend}")
+        
         self.config = Config
+        # Create the output directory once rather than on every save
+        self._processed_dir = Path(self.config.PROCESSED_DATA_PATH)
+        self._processed_dir.mkdir(parents=True, exist_ok=True)
+        self.workers = workers or os.cpu_count()
+        self.backend = backend
         self.processed_files = []
         self.failed_files = []
-        # Initialize processors
-        self.pdf_loader = PDFLoader()
+        # Initialize processors; by default pages are only spread across
+        # processes when files are processed one at a time
+        if page_workers is None and self.workers > 1:
+            page_workers = 1
+        self.pdf_loader = _get_pdf_loader(max_workers=page_workers)
+        self.force = force
+        self.assume_yes = assume_yes
+        # Cached results are only reused while the extraction settings match
+        self.cache = IngestionCache(self._processed_dir, settings=self.pdf_loader.extraction_settings())
+        # Background writer for summaries and cache entries, only running
+        # during process_document_files; without it results are saved inline
+        self._writer = None
+        self._pending_writes = []
+        # File extension -> processing method
+        self._handlers = {
+            '.pdf': self.process_pdf_file,
+            '.txt': self.process_text_file,
+            '.md': self.process_text_file,
+            '.docx': self.process_word_file,
+            '.doc': self.process_word_file,
+        }
     
     def run_ingestion(self, directory_path: str = None, pattern: str = "*.pdf", 
-                     expected_extensions: List[str] = None, file_type: str = "document"):
+                     expected_extensions: Collection[str] = None, file_type: str = "document"):
         """
         Run the complete ingestion pipeline.
         
         Args:
             directory_path: Path to document directory (uses config default if None)
             pattern: File pattern to match (default: "*.pdf")
-            expected_extensions: List of expected file extensions (default: ['.pdf'])
+            expected_extensions: Expected file extensions in any case (default: Config.PDF_EXTS)
             file_type: Type of files for display purposes (default: "document")
         """
         directory = directory_path or self.config.PDF_DATA_PATH
-        extensions = expected_extensions or ['.pdf']
+        extensions = expected_extensions or self.config.PDF_EXTS
         
-        print("=" * 80)
-        print(f"{file_type.upper()} KNOWLEDGE BASE INGESTION PIPELINE")
-        print("=" * 80)
+        logger.info("=" * 80)
+        logger.info(f"{file_type.upper()} KNOWLEDGE BASE INGESTION PIPELINE")
+        logger.info("=" * 80)
         
         # Step 1: List and validate document files
         document_files = self.list_document_files(directory, pattern, extensions, file_type)
         
         if not document_files:
-            print(f"No valid {file_type} files found. Exiting.")
+            logger.info(f"No valid {file_type} files found. Exiting.")
             return
         
         # Step 2: Confirm processing
         if not self.confirm_processing(document_files, file_type):
-            print("Processing cancelled by user.")
+            logger.info("Processing cancelled by user.")
             return
         
         # Step 3: Process each document file
@@ -54,35 +112,39 @@ class IngestionPipeline:
         self.show_final_summary()
     
     def list_document_files(self, directory_path: str, pattern: str, 
-                           expected_extensions: List[str], file_type: str) -> List[Dict]:
+                           expected_extensions: Collection[str], file_type: str) -> List[Dict]:
         """
         List and validate all document files matching the pattern.
         
         Args:
             directory_path: Path to the document directory
             pattern: File pattern to match
-            expected_extensions: List of expected file extensions
+            expected_extensions: Expected file extensions in any case
             file_type: Type of files for display purposes
             
         Returns:
             List of validated document file information
         """
-        print(f"Step 1: Discovering {file_type} files...")
-        print()
+        logger.info(f"Step 1: Discovering {file_type} files...")
+        logger.info("")
+        flush_logs()
         
-        document_files = list_and_validate_files(
+        result = list_and_validate_files(
             directory_path=directory_path,
             pattern=pattern,
             expected_extensions=expected_extensions,
             file_type=file_type
         )
         
-        return document_files
+        return result.files
     
     def confirm_processing(self, doc_files: List[Dict], file_type: str) -> bool:
         """
         Ask user for confirmation before processing.
         
+        The prompt is skipped when assume_yes is set or stdin is not a
+        terminal, so batch runs don't block waiting for input.
+        
         Args:
             doc_files: List of document file information
             file_type: Type of files for display purposes
@@ -93,11 +155,17 @@ class IngestionPipeline:
         readable_files = [f for f in doc_files if f['is_readable']]
         
         if not readable_files:
-            print(f"No readable {file_type} files found.")
+            logger.info(f"No readable {file_type} files found.")
             return False
         
-        print("Step 2: Processing confirmation")
-        print(f"Ready to process {len(readable_files)} {file_type} files.")
+        logger.info("Step 2: Processing confirmation")
+        logger.info(f"Ready to process {len(readable_files)} {file_type} files.")
+        
+        if self.assume_yes or not sys.stdin.isatty():
+            logger.info("Proceeding without confirmation.")
+            return True
+        
+        flush_logs()
         
         while True:
             response = input("Do you want to proceed? (Y/n): ").lower().strip()
@@ -106,8 +174,7 @@ class IngestionPipeline:
             elif response in ['n', 'no']:
                 return False
             else:
-                return True
-                print("Please enter 'y' for yes or 'n' for no.")
+                logger.info("Please enter 'y' for yes or 'n' for no.")
     
     def process_document_files(self, doc_files: List[Dict], file_type: str):
         """
@@ -117,34 +184,116 @@ class IngestionPipeline:
             doc_files: List of document file information
             file_type: Type of files for display purposes
         """
-        print(f"\nStep 3: Processing {file_type} files...")
-        print("-" * 50)
+        logger.info(f"\nStep 3: Processing {file_type} files...")
+        logger.info("-" * 50)
         
         readable_files = [f for f in doc_files if f['is_readable']]
+        parallel = self.workers > 1 and len(readable_files) > 1
         
-        for i, file_info in enumerate(readable_files, 1):
-            print(f"\nProcessing {i}/{len(readable_files)}: {file_info['name']}")
+        # Write results on a background thread so the next file's extraction
+        # and OCR can start straight away. Skipped whenever worker processes
+        # are forked (file workers, or page workers in the PDF loader), so
+        # no thread is running in the parent at fork time.
+        if self.pdf_loader.max_workers == 1 and not (parallel and self.backend == "process"):
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-writer")
+        
+        try:
+            if parallel:
+                self._process_files_in_parallel(readable_files)
+            else:
+                for i, file_info in enumerate(readable_files, 1):
+                    logger.info(f"\nProcessing {i}/{len(readable_files)}: {file_info['name']}")
+                    
+                    try:
+                        # Process based on file type/extension
+                        processing_result = self.process_single_file(file_info)
+                        self._record_success(file_info, processing_result)
+                        
+                    except Exception as e:
+                        self._record_failure(file_info, e)
+                    
+                    flush_logs()
             
-            try:
-                # Process based on file type/extension
-                processing_result = self.process_single_file(file_info)
-                
-                print(f"  ✓ Successfully processed: {file_info['name']}")
-                
-                # Store both original file info and processing results
-                processed_file_data = {
-                    'file_info': file_info,
-                    'processing_result': processing_result
+            self.wait_for_writes()
+        finally:
+            if self._writer is not None:
+                self._writer.shutdown(wait=True)
+                self._writer = None
+    
+    def _process_files_in_parallel(self, readable_files: List[Dict]):
+        """
+        Process files across a pool of worker processes or threads.
+        
+        Args:
+            readable_files: List of readable document file information
+        """
+        max_workers = min(self.workers, len(readable_files))
+        
+        log_listener = None
+        
+        if self.backend == "thread":
+            logger.info(f"Using {max_workers} worker threads")
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            process_one = self.process_single_file
+        else:
+            logger.info(f"Using {max_workers} worker processes")
+            # Workers send their log records back over a queue so only the
+            # parent writes to stdout, through its buffered handler
+            root_logger = logging.getLogger()
+            log_queue = multiprocessing.Queue()
+            log_listener = QueueListener(log_queue, *root_logger.handlers, respect_handler_level=True)
+            log_listener.start()
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(self.force, log_queue, root_logger.level)
+            )
+            process_one = _process_one
+        
+        flush_logs()
+        
+        try:
+            with executor:
+                futures = {
+                    executor.submit(process_one, file_info): file_info
+                    for file_info in readable_files
                 }
-                self.processed_files.append(processed_file_data)
                 
-            except Exception as e:
-                print(f"  ✗ Failed to process: {file_info['name']}")
-                print(f"    Error: {str(e)}")
-                self.failed_files.append({
-                    'file_info': file_info,
-                    'error': str(e)
-                })
+                for i, future in enumerate(as_completed(futures), 1):
+                    file_info = futures[future]
+                    logger.info(f"\nFinished {i}/{len(readable_files)}: {file_info['name']}")
+                    
+                    try:
+                        self._record_success(file_info, future.result())
+                    except Exception as e:
+                        self._record_failure(file_info, e)
+                    
+                    flush_logs()
+        finally:
+            if log_listener is not None:
+                log_listener.stop()
+    
+    def _record_success(self, file_info: Dict, processing_result):
+        """Store a successfully processed file with its processing results."""
+        logger.info(f"  ✓ Successfully processed: {file_info['name']}")
+        
+        # Every entry has the same shape so the final summary needn't check;
+        # the extracted documents are dropped so they don't stay in memory
+        # for the whole batch
+        processed_file_data = {
+            'file_info': file_info,
+            'processing_result': _without_documents(processing_result or {})
+        }
+        self.processed_files.append(processed_file_data)
+    
+    def _record_failure(self, file_info: Dict, error: Exception):
+        """Store a file that failed to process with its error."""
+        logger.error(f"  ✗ Failed to process: {file_info['name']}")
+        logger.error(f"    Error: {str(error)}")
+        self.failed_files.append({
+            'file_info': file_info,
+            'error': str(error)
+        })
     
     def process_single_file(self, file_info: Dict):
         """
@@ -153,16 +302,40 @@ class IngestionPipeline:
         Args:
             file_info: Dictionary containing file information
         """
+        if not self.force:
+            cached_result = self.cache.lookup(file_info)
+            if cached_result is not None:
+                logger.info("  - Unchanged since last run, using cached result")
+                return cached_result
+        
         file_extension = file_info.get('extension', '').lower()
         
-        if file_extension == '.pdf':
-            return self.process_pdf_file(file_info)
-        elif file_extension in ['.txt', '.md']:
-            return self.process_text_file(file_info)
-        elif file_extension in ['.docx', '.doc']:
-            return self.process_word_file(file_info)
-        else:
+        handler = self._handlers.get(file_extension)
+        if handler is None:
             raise ValueError(f"Unsupported file type: {file_extension}")
+        
+        # Handlers save the summary, which also records the file in the
+        # cache once the summary is on disk
+        return handler(file_info)
+    
+    def wait_for_writes(self):
+        """
+        Wait for summary and cache writes queued on the writer thread.
+        
+        Files whose results could not be saved are moved from the processed
+        to the failed files, so they are neither reported nor cached as done.
+        """
+        pending, self._pending_writes = self._pending_writes, []
+        
+        for file_info, future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                error = Exception(f"Saving processing results failed: {str(e)}")
+                self.processed_files = [
+                    p for p in self.processed_files if p['file_info']['path'] != file_info['path']
+                ]
+                self._record_failure(file_info, error)
     
     def process_pdf_file(self, file_info: Dict):
         """Process a PDF file using PDFLoader."""
@@ -180,13 +353,13 @@ class IngestionPipeline:
     
     def process_text_file(self, file_info: Dict):
         """Process a text file."""
-        print("  - Reading text content...")
+        logger.info("  - Reading text content...")
         # TODO: Implement text file processing
         raise NotImplementedError("Text file processing not yet implemented")
     
     def process_word_file(self, file_info: Dict):
         """Process a Word document."""
-        print("  - Extracting text from Word document...")
+        logger.info("  - Extracting text from Word document...")
         # TODO: Implement Word document processing
         raise NotImplementedError("Word document processing not yet implemented")
     
@@ -199,27 +372,20 @@ class IngestionPipeline:
             file_info: Original file information
             pdf_result: Result from PDF processing
         """
-        import json
-        
-        processed_dir = Path(self.config.PROCESSED_DATA_PATH)
-        processed_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Create a summary file with processing results
-        file_name = file_info['name'].replace('.pdf', '')
-        summary_file = processed_dir / f"{file_name}_summary.json"
-        
         summary_data = {
             'original_file': file_info['path'],
             'file_name': pdf_result['file_name'],
-            'processing_timestamp': str(Path(file_info['path']).stat().st_mtime),
+            # Modification time from the discovery scan; the file isn't stat'ed again
+            'processing_timestamp': str(file_info['modified']),
             'text_documents': pdf_result['text_document_count'],
             'image_documents': pdf_result['image_document_count'],
             'total_documents': pdf_result['total_document_count'],
+            'extraction_errors': pdf_result.get('extraction_errors', 0),
             'documents_preview': []
         }
         
         # Add preview of first few documents
-        for i, doc in enumerate(pdf_result['documents'][:5]):
+        for i, doc in enumerate(islice(pdf_result['documents'], 5)):
             doc_preview = {
                 'document_index': i,
                 'type': doc.metadata['type'],
@@ -232,66 +398,110 @@ class IngestionPipeline:
             
             summary_data['documents_preview'].append(doc_preview)
         
-        # Save summary to JSON file
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary_data, f, indent=2, ensure_ascii=False)
+        if self.config.PER_FILE_SUMMARIES:
+            # Create a summary file with processing results
+            summary_file = self._processed_dir / f"{file_info['stem']}_summary.json"
+            mode, data = 'wb', orjson.dumps(summary_data, option=orjson.OPT_INDENT_2)
+        else:
+            # Append one line per file to a shared manifest; a single write
+            # on an append-mode file keeps lines from parallel workers intact
+            summary_file = self._processed_dir / self.config.PROCESSED_MANIFEST
+            mode, data = 'ab', orjson.dumps(summary_data) + b"\n"
+        
+        if self._writer is not None:
+            future = self._writer.submit(self._save_results, file_info, pdf_result, summary_file, mode, data)
+            self._pending_writes.append((file_info, future))
+        else:
+            self._save_results(file_info, pdf_result, summary_file, mode, data)
         
-        print(f"  - Saved processing summary to: {summary_file}")
+        logger.info(f"  - Saving processing summary to: {summary_file}")
+        if pdf_result.get('extraction_errors'):
+            logger.warning(f"  - Not caching result: {pdf_result['extraction_errors']} extraction errors, "
+                           f"the file will be processed again next run")
+    
+    def _save_results(self, file_info: Dict, processing_result: Dict,
+                      summary_file: Path, mode: str, data: bytes):
+        """Write a file's summary, then record it in the cache."""
+        with open(summary_file, mode) as f:
+            f.write(data)
+        
+        # Only cache complete results whose summary was written, so files
+        # that hit extraction errors (e.g. OCR unavailable) are retried
+        if not processing_result.get('extraction_errors'):
+            self.cache.store(file_info, processing_result)
     
     def show_final_summary(self):
         """Show the final processing summary."""
-        print("\n" + "=" * 80)
-        print("INGESTION SUMMARY")
-        print("=" * 80)
+        logger.info("\n" + "=" * 80)
+        logger.info("INGESTION SUMMARY")
+        logger.info("=" * 80)
         
-        print(f"Successfully processed: {len(self.processed_files)} files")
-        print(f"Failed to process: {len(self.failed_files)} files")
+        logger.info(f"Successfully processed: {len(self.processed_files)} files")
+        logger.info(f"Failed to process: {len(self.failed_files)} files")
         
         if self.processed_files:
-            print("\nSuccessfully processed files:")
+            lines = ["\nSuccessfully processed files:"]
             for processed_item in self.processed_files:
-                # Handle both old format (just file_info) and new format (dict with file_info and processing_result)
-                if isinstance(processed_item, dict) and 'file_info' in processed_item:
-                    # New format
-                    file_info = processed_item['file_info']
-                    processing_result = processed_item.get('processing_result', {})
-                    
-                    if isinstance(processing_result, dict) and 'total_document_count' in processing_result:
-                        # PDF processing result
-                        doc_count = processing_result['total_document_count']
-                        print(f"  ✓ {file_info['name']} ({file_info['size_mb']} MB) - {doc_count} documents extracted")
-                    else:
-                        # Other file types
-                        print(f"  ✓ {file_info['name']} ({file_info['size_mb']} MB)")
+                file_info = processed_item['file_info']
+                doc_count = processed_item['processing_result'].get('total_document_count')
+                
+                if doc_count is not None:
+                    lines.append(f"  ✓ {file_info['name']} ({file_info['size_mb']} MB) - {doc_count} documents extracted")
                 else:
-                    # Old format (just file_info dict)
-                    file_info = processed_item
-                    print(f"  ✓ {file_info['name']} ({file_info['size_mb']} MB)")
+                    lines.append(f"  ✓ {file_info['name']} ({file_info['size_mb']} MB)")
+            logger.info("\n".join(lines))
         
         if self.failed_files:
-            print("\nFailed files:")
-            for failed in self.failed_files:
-                print(f"  ✗ {failed['file_info']['name']} - {failed['error']}")
-        
-        # Calculate totals handling both old and new formats
-        total_size = 0
-        total_documents = 0
-        
-        for processed_item in self.processed_files:
-            if isinstance(processed_item, dict) and 'file_info' in processed_item:
-                # New format
-                total_size += processed_item['file_info']['size_mb']
-                processing_result = processed_item.get('processing_result', {})
-                if isinstance(processing_result, dict):
-                    total_documents += processing_result.get('total_document_count', 0)
-            else:
-                # Old format
-                total_size += processed_item['size_mb']
+            logger.info("\n".join(
+                ["\nFailed files:"] +
+                [f"  ✗ {failed['file_info']['name']} - {failed['error']}" for failed in self.failed_files]
+            ))
+        
+        total_size = sum(p['file_info']['size_mb'] for p in self.processed_files)
+        total_documents = sum(p['processing_result'].get('total_document_count', 0) for p in self.processed_files)
         
-        print(f"\nTotal processed data: {total_size:.2f} MB")
+        logger.info(f"\nTotal processed data: {total_size:.2f} MB")
         if total_documents > 0:
-            print(f"Total documents extracted: {total_documents}")
-        print("Ingestion pipeline completed.")
+            logger.info(f"Total documents extracted: {total_documents}")
+        logger.info("Ingestion pipeline completed.")
+        flush_logs()
+
+
+@lru_cache(maxsize=None)
+def _get_pdf_loader(max_workers: int = None) -> PDFLoader:
+    """Shared PDFLoader per worker setting, reused by every pipeline in the process."""
+    return PDFLoader(max_workers=max_workers)
+
+
+# Per-process pipeline used by worker processes in parallel ingestion
+_worker_pipeline = None
+
+
+def _init_worker(force: bool, log_queue, log_level: int):
+    """Create the pipeline used by a worker process for all its files."""
+    global _worker_pipeline
+    # Replace any handlers inherited from the parent with one that forwards
+    # records to the parent's listener
+    root_logger = logging.getLogger()
+    root_logger.handlers[:] = [QueueHandler(log_queue)]
+    root_logger.setLevel(log_level)
+    
+    # Files are already spread across processes, so keep each PDF's pages
+    # in-process rather than starting a nested pool
+    _worker_pipeline = IngestionPipeline(force=force, page_workers=1)
+
+
+def _process_one(file_info: Dict):
+    """Process a single file in a worker process."""
+    # Results are saved inline here, so a failed write fails the file
+    processing_result = _worker_pipeline.process_single_file(file_info)
+    # Extracted documents are dropped so they aren't pickled back to the parent
+    return _without_documents(processing_result)
+
+
+def _without_documents(processing_result: Dict) -> Dict:
+    """Copy of a processing result without its (potentially large) documents list."""
+    return {k: v for k, v in processing_result.items() if k != 'documents'}
 
 
 # Convenience functions for common use cases
@@ -301,7 +511,7 @@ def run_pdf_ingestion(directory_path: str = None):
     pipeline.run_ingestion(
         directory_path=directory_path,
         pattern="*.pdf",
-        expected_extensions=['.pdf'],
+        expected_extensions=Config.PDF_EXTS,
         file_type="PDF"
     )
 
@@ -312,7 +522,7 @@ def run_text_ingestion(directory_path: str = None):
     pipeline.run_ingestion(
         directory_path=directory_path,
         pattern="*.txt",
-        expected_extensions=['.txt', '.md'],
+        expected_extensions=Config.TEXT_EXTS,
         file_type="text"
     )
 
@@ -323,13 +533,15 @@ def run_document_ingestion(directory_path: str = None):
     pipeline.run_ingestion(
         directory_path=directory_path,
         pattern="*.*",
-        expected_extensions=['.pdf', '.txt', '.md', '.docx', '.doc'],
+        expected_extensions=Config.DOC_EXTS,
         file_type="document"
     )
 
 
 def main():
     """Main entry point for the ingestion pipeline."""
+    setup_logging()
+    
     # Default to PDF ingestion for backward compatibility
     run_pdf_ingestion()
 
@@ -1,8 +1,50 @@
 """File utilities for document discovery and validation."""
 
+import logging
 import os
+import re
+import stat
+from fnmatch import translate
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict
+from typing import Callable, Collection, FrozenSet, Iterator, List, Dict, NamedTuple, Optional
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class FileScanResult(NamedTuple):
+    """Validated files from a directory scan plus how many are readable."""
+    files: List[Dict]
+    readable_count: int
+
+
+def _normalize_extensions(expected_extensions: Collection[str]) -> Optional[FrozenSet[str]]:
+    """
+    Lower-case expected extensions into a set for O(1) lookups.
+    
+    Called once per scan, so the per-file checks are plain set lookups.
+    """
+    if not expected_extensions:
+        return None
+    return frozenset(ext.lower() for ext in expected_extensions)
+
+
+def _name_matcher(pattern: str) -> Callable[[str], bool]:
+    """
+    Build a file name filter for a glob pattern.
+    
+    "*.*" accepts every file and "*.<ext>" is a plain suffix check; any
+    other pattern is compiled once rather than re-parsed per name.
+    """
+    if pattern == "*.*":
+        return lambda name: True
+    
+    suffix = pattern[1:]
+    if pattern.startswith("*.") and not any(c in suffix for c in "*?["):
+        return lambda name: name.endswith(suffix)
+    
+    return re.compile(translate(pattern)).match
 
 
 def get_files(directory_path: str, pattern: str = "*.*") -> List[str]:
@@ -19,161 +61,248 @@ def get_files(directory_path: str, pattern: str = "*.*") -> List[str]:
     directory = Path(directory_path)
     
     if not directory.exists():
-        print(f"Directory does not exist: {directory_path}")
+        logger.warning(f"Directory does not exist: {directory_path}")
         return []
     
     if not directory.is_dir():
-        print(f"Path is not a directory: {directory_path}")
+        logger.warning(f"Path is not a directory: {directory_path}")
         return []
     
-    # Find all files matching the pattern
-    files = list(directory.glob(pattern))
+    if "**" in pattern:
+        # Recursive patterns need pathlib to walk subdirectories
+        file_paths = [str(path) for path in directory.glob(pattern) if path.is_file()]
+    else:
+        # Find all files matching the pattern; DirEntry caches its type, so
+        # this costs no extra stat call per entry
+        matches = _name_matcher(pattern)
+        with os.scandir(directory) as entries:
+            file_paths = [
+                str(directory / entry.name)
+                for entry in entries
+                if matches(entry.name) and entry.is_file()
+            ]
     
-    # Convert to strings and sort
-    file_paths = [str(file_path) for file_path in files]
     file_paths.sort()
     
     return file_paths
 
 
-def get_file_info(file_path: str, expected_extensions: List[str] = None) -> Dict:
+def get_file_info(file_path: str, expected_extensions: Collection[str] = None) -> Dict:
     """
     Get information about a single file.
     
     Args:
         file_path: Path to the file
-        expected_extensions: List of expected file extensions (e.g., ['.pdf', '.txt'])
+        expected_extensions: Expected file extensions in any case (e.g., Config.DOC_EXTS or ['.pdf', '.txt'])
         
     Returns:
         Dictionary with file information or None if invalid
     """
+    return _get_file_info(file_path, _normalize_extensions(expected_extensions))
+
+
+def _get_file_info(file_path: str, extensions: Optional[FrozenSet[str]]) -> Dict:
+    """get_file_info with the expected extensions already normalized."""
     try:
         file_path_obj = Path(file_path)
         
-        if not file_path_obj.exists():
-            print(f"File does not exist: {file_path}")
+        # One stat call covers the existence and file type checks and
+        # provides the size and modification time
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
+            logger.warning(f"File does not exist: {file_path}")
             return None
         
-        if not file_path_obj.is_file():
-            print(f"Path is not a file: {file_path}")
+        if not stat.S_ISREG(file_stat.st_mode):
+            logger.warning(f"Path is not a file: {file_path}")
             return None
         
         # Check file extension if expected extensions are provided
-        if expected_extensions:
-            if file_path_obj.suffix.lower() not in [ext.lower() for ext in expected_extensions]:
-                print(f"File extension not in expected types {expected_extensions}: {file_path}")
-                return None
-        
-        # Get file stats
-        stat = file_path_obj.stat()
-        
-        file_info = {
-            'path': str(file_path_obj),
-            'name': file_path_obj.name,
-            'extension': file_path_obj.suffix,
-            'size_bytes': stat.st_size,
-            'size_mb': round(stat.st_size / (1024 * 1024), 2),
-            'modified': stat.st_mtime,
-            'is_readable': os.access(file_path, os.R_OK)
-        }
+        if extensions and file_path_obj.suffix.lower() not in extensions:
+            logger.info(f"File extension not in expected types {sorted(extensions)}: {file_path}")
+            return None
         
-        return file_info
+        return _build_file_info(str(file_path_obj), file_path_obj.name, file_path_obj.suffix, file_stat)
         
     except Exception as e:
-        print(f"Error getting file info for {file_path}: {str(e)}")
+        logger.warning(f"Error getting file info for {file_path}: {str(e)}")
         return None
 
 
-def validate_files(file_paths: List[str], expected_extensions: List[str] = None) -> List[Dict]:
+def _build_file_info(path: str, name: str, extension: str, file_stat: os.stat_result) -> Dict:
+    """Build the file information dictionary from an existing stat result."""
+    return {
+        'path': path,
+        'name': name,
+        'stem': name[:-len(extension)] if extension else name,
+        'extension': extension,
+        'size_bytes': file_stat.st_size,
+        'size_mb': round(file_stat.st_size / (1024 * 1024), 2),
+        'modified': file_stat.st_mtime,
+        'is_readable': os.access(path, os.R_OK)
+    }
+
+
+def scan_files(directory_path: str, pattern: str = "*.*", 
+               expected_extensions: Collection[str] = None) -> Iterator[Dict]:
+    """
+    Stream information about the files in a directory matching a pattern.
+    
+    Combines get_files, validate_files and get_file_info in a single pass:
+    names and extensions are checked before anything is stat'ed, and each
+    remaining file is stat'ed once through its cached os.DirEntry.
+    
+    Args:
+        directory_path: Path to the directory containing files
+        pattern: File pattern to match (default: "*.*")
+        expected_extensions: Expected file extensions in any case (e.g., Config.DOC_EXTS or ['.pdf', '.txt'])
+        
+    Yields:
+        Dictionary with file information for each valid file
+    """
+    directory = Path(directory_path)
+    
+    if not directory.exists():
+        logger.warning(f"Directory does not exist: {directory_path}")
+        return
+    
+    if not directory.is_dir():
+        logger.warning(f"Path is not a directory: {directory_path}")
+        return
+    
+    extensions = _normalize_extensions(expected_extensions)
+    
+    if "**" in pattern:
+        # Recursive patterns walk subdirectories, so fall back to per-path stats
+        yield from validate_files(get_files(directory_path, pattern), extensions)
+        return
+    
+    matches = _name_matcher(pattern)
+    
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not matches(entry.name):
+                continue
+            
+            try:
+                if not entry.is_file():
+                    continue
+                
+                # Check file extension if expected extensions are provided
+                extension = os.path.splitext(entry.name)[1]
+                if extensions and extension.lower() not in extensions:
+                    logger.info(f"File extension not in expected types {sorted(extensions)}: {entry.path}")
+                    continue
+                
+                yield _build_file_info(entry.path, entry.name, extension, entry.stat())
+                
+            except OSError as e:
+                logger.warning(f"Error getting file info for {entry.path}: {str(e)}")
+
+
+def validate_files(file_paths: List[str], expected_extensions: Collection[str] = None) -> List[Dict]:
     """
     Validate files and get their info.
     
     Args:
         file_paths: List of file paths
-        expected_extensions: List of expected file extensions (e.g., ['.pdf', '.txt'])
+        expected_extensions: Expected file extensions in any case (e.g., Config.DOC_EXTS or ['.pdf', '.txt'])
         
     Returns:
         List of dictionaries with file information
     """
     validated_files = []
+    extensions = _normalize_extensions(expected_extensions)
     
     for file_path in file_paths:
-        file_info = get_file_info(file_path, expected_extensions)
+        file_info = _get_file_info(file_path, extensions)
         if file_info:
             validated_files.append(file_info)
     
     return validated_files
 
 
-def print_files_summary(files: List[Dict], file_type: str = "document"):
+def print_files_summary(files: List[Dict], file_type: str = "document") -> int:
     """
     Print a summary of files found.
     
     Args:
         files: List of file info dictionaries
         file_type: Type of files for display purposes (e.g., "document", "PDF", "text")
+        
+    Returns:
+        Number of readable files
     """
     if not files:
-        print(f"No {file_type} files found.")
-        return
+        logger.info(f"No {file_type} files found.")
+        return 0
     
-    print(f"\nFound {len(files)} {file_type} files:")
-    print("-" * 80)
-    print(f"{'#':<3} {'Name':<40} {'Size (MB)':<10} {'Status':<10}")
-    print("-" * 80)
+    readable_files = [f for f in files if f['is_readable']]
+    readable_count = len(readable_files)
+    total_size = sum(f['size_mb'] for f in readable_files)
     
-    total_size = 0
-    readable_count = 0
-    
-    for i, file_info in enumerate(files, 1):
-        status = "OK" if file_info['is_readable'] else "ERROR"
-        if file_info['is_readable']:
-            readable_count += 1
-            total_size += file_info['size_mb']
-        
-        print(f"{i:<3} {file_info['name']:<40} {file_info['size_mb']:<10} {status:<10}")
+    # Build the whole table and log it once rather than a line at a time
+    rule = "-" * 80
+    lines = [
+        f"\nFound {len(files)} {file_type} files:",
+        rule,
+        f"{'#':<3} {'Name':<40} {'Size (MB)':<10} {'Status':<10}",
+        rule,
+    ]
+    lines.extend(
+        f"{i:<3} {file_info['name']:<40} {file_info['size_mb']:<10} {'OK' if file_info['is_readable'] else 'ERROR':<10}"
+        for i, file_info in enumerate(files, 1)
+    )
+    lines.extend([
+        rule,
+        f"Total readable files: {readable_count}/{len(files)}",
+        f"Total size: {total_size:.2f} MB",
+        "",
+    ])
+    logger.info("\n".join(lines))
     
-    print("-" * 80)
-    print(f"Total readable files: {readable_count}/{len(files)}")
-    print(f"Total size: {total_size:.2f} MB")
-    print()
+    return readable_count
 
 
 def list_and_validate_files(directory_path: str, pattern: str = "*.*", 
-                           expected_extensions: List[str] = None, 
-                           file_type: str = "document") -> List[Dict]:
+                           expected_extensions: Collection[str] = None, 
+                           file_type: str = "document") -> FileScanResult:
     """
     Main function to list and validate files matching a pattern.
     
     Args:
         directory_path: Path to the directory
         pattern: File pattern to match (e.g., "*.pdf", "*.txt", "*.*")
-        expected_extensions: List of expected file extensions (e.g., ['.pdf', '.txt'])
+        expected_extensions: Expected file extensions in any case (e.g., Config.DOC_EXTS or ['.pdf', '.txt'])
         file_type: Type of files for display purposes (e.g., "document", "PDF", "text")
         
     Returns:
-        List of validated file information
+        FileScanResult with validated file information and readable count
     """
-    print(f"Scanning directory: {directory_path}")
+    logger.info(f"Scanning directory: {directory_path}")
     
-    # Get all files matching the pattern
-    file_paths = get_files(directory_path, pattern)
+    # Normalize the expected extensions once for the whole scan
+    extensions = _normalize_extensions(expected_extensions)
     
-    if not file_paths:
-        print(f"No files matching pattern '{pattern}' found in the directory.")
-        return []
+    # Get and validate all files matching the pattern in one pass
+    validated_files = sorted(
+        scan_files(directory_path, pattern, extensions),
+        key=itemgetter('name')
+    )
     
-    # Validate files
-    validated_files = validate_files(file_paths, expected_extensions)
+    if not validated_files:
+        logger.info(f"No files matching pattern '{pattern}' found in the directory.")
+        return FileScanResult([], 0)
     
     # Print summary
-    print_files_summary(validated_files, file_type)
+    readable_count = print_files_summary(validated_files, file_type)
     
-    return validated_files
+    return FileScanResult(validated_files, readable_count)
 
 
 # Convenience functions for common use cases
-def list_and_validate_documents(directory_path: str, pattern: str = "*.pdf") -> List[Dict]:
+def list_and_validate_documents(directory_path: str, pattern: str = "*.pdf") -> FileScanResult:
     """
     Convenience function to list and validate document files (defaults to PDF).
     
@@ -182,17 +311,17 @@ def list_and_validate_documents(directory_path: str, pattern: str = "*.pdf") ->
         pattern: File pattern to match (default: "*.pdf")
         
     Returns:
-        List of validated document file information
+        FileScanResult with validated document file information
     """
     return list_and_validate_files(
         directory_path=directory_path,
         pattern=pattern,
-        expected_extensions=['.pdf'],
+        expected_extensions=Config.PDF_EXTS,
         file_type="document"
     )
 
 
-def list_and_validate_pdfs(directory_path: str) -> List[Dict]:
+def list_and_validate_pdfs(directory_path: str) -> FileScanResult:
     """
     Convenience function to list and validate PDF files.
     
@@ -200,11 +329,11 @@ def list_and_validate_pdfs(directory_path: str) -> List[Dict]:
         directory_path: Path to the PDF directory
         
     Returns:
-        List of validated PDF file information
+        FileScanResult with validated PDF file information
     """
     return list_and_validate_files(
         directory_path=directory_path,
         pattern="*.pdf",
-        expected_extensions=['.pdf'],
+        expected_extensions=Config.PDF_EXTS,
         file_type="PDF"
     )
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""Logging setup shared by the command line entry points."""
+
+import logging
+import sys
+from logging.handlers import BufferingHandler
+from config import Config
+
+
+class BufferedStreamHandler(BufferingHandler):
+    """Collect formatted log records and write them to a stream in one call."""
+    
+    def __init__(self, stream=None, capacity: int = 64):
+        """
+        Initialize the handler.
+        
+        Args:
+            stream: Stream to write to (default: sys.stdout)
+            capacity: Number of records to buffer before writing
+        """
+        super().__init__(capacity)
+        self.stream = stream or sys.stdout
+    
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        """Write out when the buffer is full or a warning comes in."""
+        return super().shouldFlush(record) or record.levelno >= logging.WARNING
+    
+    def flush(self):
+        """Write all buffered records with a single write call."""
+        self.acquire()
+        try:
+            if self.buffer:
+                self.stream.write("".join(f"{self.format(record)}\n" for record in self.buffer))
+                self.stream.flush()
+                self.buffer.clear()
+        finally:
+            self.release()
+
+
+def setup_logging(quiet: bool = False):
+    """
+    Route log output through a single buffered handler on stdout.
+    
+    Args:
+        quiet: Only show warnings and errors
+    """
+    handler = BufferedStreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(
+        level=logging.WARNING if quiet else Config.LOG_LEVEL,
+        handlers=[handler],
+        force=True
+    )
+
+
+def flush_logs():
+    """Write out any log records still buffered by the root handlers."""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
@@ -0,0 +1,64 @@
+"""Tests for reusing cached ingestion results."""
+
+from src.ingestion.cache import IngestionCache
+from src.ingestion.pipeline import IngestionPipeline
+from src.utils.file_utils import get_file_info
+
+
+class FakePDFLoader:
+    """PDF loader returning a fixed result, so no PDF or OCR engine is needed."""
+    
+    def __init__(self, extraction_errors=0):
+        self.extraction_errors = extraction_errors
+    
+    def load_pdf(self, pdf_path):
+        return {
+            'file_path': pdf_path,
+            'file_name': 'sample',
+            'documents': [],
+            'text_document_count': 0,
+            'image_document_count': 0,
+            'total_document_count': 0,
+            'extraction_errors': self.extraction_errors
+        }
+
+
+def _sample_pdf(tmp_path):
+    pdf_path = tmp_path / "sample.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4\n")
+    return get_file_info(str(pdf_path), ['.pdf'])
+
+
+def test_lookup_misses_when_settings_change(tmp_path):
+    file_info = _sample_pdf(tmp_path)
+    result = {'total_document_count': 3}
+    
+    IngestionCache(tmp_path, settings={'MAX_PAGES_PER_PDF': 5}).store(file_info, result)
+    
+    assert IngestionCache(tmp_path, settings={'MAX_PAGES_PER_PDF': 5}).lookup(file_info) == result
+    assert IngestionCache(tmp_path, settings={'MAX_PAGES_PER_PDF': None}).lookup(file_info) is None
+
+
+def _pipeline(tmp_path, monkeypatch, extraction_errors):
+    monkeypatch.chdir(tmp_path)
+    pipeline = IngestionPipeline(page_workers=1)
+    pipeline.pdf_loader = FakePDFLoader(extraction_errors)
+    return pipeline
+
+
+def test_failed_extraction_is_not_cached(tmp_path, monkeypatch):
+    file_info = _sample_pdf(tmp_path)
+    pipeline = _pipeline(tmp_path, monkeypatch, extraction_errors=2)
+    
+    pipeline.process_single_file(file_info)
+    
+    assert pipeline.cache.lookup(file_info) is None
+
+
+def test_complete_extraction_is_cached(tmp_path, monkeypatch):
+    file_info = _sample_pdf(tmp_path)
+    pipeline = _pipeline(tmp_path, monkeypatch, extraction_errors=0)
+    
+    pipeline.process_single_file(file_info)
+    
+    assert pipeline.cache.lookup(file_info)['extraction_errors'] == 0